@@ -0,0 +1,188 @@
+"""
+Real-execution benchmarking: run each registry candidate against a local stand-in and measure it.
+A stand-in is a pluggable adapter per registry category, configured from the agent's features and metrics
+(e.g. a local file-search engine over a fixture corpus from the generate_mock_data generator).
+run_candidates returns measured latency, throughput and retrieval accuracy per agent; the pipelines pass them to
+simulate_run, which reports them next to the registry-based scores. Cached registry entries are never modified.
+"""
+
+import math
+import os
+import random
+import re
+import time
+from collections import Counter
+
+import mock_corpus
+from schemas import BenchmarkMetrics
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def build_fixture_corpus(use_case_id: str, use_case_name: str, n_docs: int = 200, n_queries: int = 100, seed: int = 0) -> dict:
+    """
+    Fixture corpus from the generate_mock_data generator (mock_corpus.py). Same arguments -> same corpus.
+    Each query samples words from one document, which is its ground truth.
+    Returns {"documents": [{id, format, text}], "queries": [{query, relevant_ids}]}.
+    """
+    documents = [
+        {"id": r["id"], "format": r["format"], "text": r["text"]}
+        for r in mock_corpus.iter_records(use_case_id, use_case_name, n_docs, seed)
+    ]
+    rng = random.Random(f"{use_case_id}:{seed}:queries")
+    noise = _tokens(use_case_name)
+    queries = []
+    for _ in range(n_queries if documents else 0):
+        doc = rng.choice(documents)
+        words = sorted(set(_tokens(doc["text"])))
+        query = rng.sample(words, min(3, len(words))) + ([rng.choice(noise)] if noise else [])
+        queries.append({"query": " ".join(query), "relevant_ids": [doc["id"]]})
+    return {"documents": documents, "queries": queries}
+
+
+class BenchmarkAdapter:
+    """Local stand-in for a registry agent. Subclasses implement index() and search()."""
+
+    name = "base"
+
+    def __init__(self, agent: dict):
+        self.agent = agent
+
+    def index(self, documents: list[dict]) -> None:
+        raise NotImplementedError
+
+    def search(self, query: str, k: int) -> list[str]:
+        """Return up to k document ids, best first."""
+        raise NotImplementedError
+
+
+_ADAPTERS: dict[str, type[BenchmarkAdapter]] = {}
+
+
+def register_adapter(*categories: str):
+    """Class decorator: use this adapter for agents in the given registry categories."""
+
+    def wrap(cls: type[BenchmarkAdapter]) -> type[BenchmarkAdapter]:
+        for c in categories:
+            _ADAPTERS[c.lower()] = cls
+        return cls
+
+    return wrap
+
+
+def adapter_for(agent: dict) -> BenchmarkAdapter | None:
+    """Adapter instance for this agent's category, or None if the category has no local stand-in."""
+    cls = _ADAPTERS.get((agent.get("category") or "").lower())
+    return cls(agent) if cls else None
+
+
+@register_adapter("file-search", "rag")
+class LocalFileSearchAdapter(BenchmarkAdapter):
+    """
+    TF-IDF file search over the fixture corpus, shaped by the agent's registry entry:
+    only documents in its file_formats are indexed; semantic/similarity/embedding features also match on
+    word prefixes (on top of exact tokens, at half weight); hybrid search adds an exact-phrase bonus.
+    """
+
+    name = "local-file-search"
+
+    def __init__(self, agent: dict):
+        super().__init__(agent)
+        features = " ".join(agent.get("features", [])).lower()
+        self.formats = {f.lower() for f in (agent.get("metrics") or {}).get("file_formats", [])}
+        self.fuzzy = any(w in features for w in ("semantic", "similarity", "embedding"))
+        self.hybrid = "hybrid" in features
+        self._postings: dict[str, dict[str, int]] = {}
+        self._texts: dict[str, str] = {}
+        self._idf: dict[str, float] = {}
+
+    def _terms(self, text: str) -> list[str]:
+        toks = _tokens(text)
+        # Prefix terms live in their own "~" namespace so IDs like sec0000123 still match exactly
+        return toks + [f"~{t[:5]}" for t in toks] if self.fuzzy else toks
+
+    def index(self, documents: list[dict]) -> None:
+        for doc in documents:
+            if self.formats and doc.get("format", "").lower() not in self.formats:
+                continue
+            self._texts[doc["id"]] = doc["text"].lower()
+            for term, tf in Counter(self._terms(doc["text"])).items():
+                self._postings.setdefault(term, {})[doc["id"]] = tf
+        n = max(1, len(self._texts))
+        self._idf = {t: math.log(1 + n / len(p)) for t, p in self._postings.items()}
+
+    def search(self, query: str, k: int) -> list[str]:
+        scores: dict[str, float] = {}
+        for term in self._terms(query):
+            for doc_id, tf in self._postings.get(term, {}).items():
+                weight = 0.5 if term.startswith("~") else 1.0
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * tf * self._idf[term]
+        if self.hybrid:
+            q = query.lower()
+            for doc_id in scores:
+                if q in self._texts[doc_id]:
+                    scores[doc_id] += 1.0
+        return [d for d, _ in sorted(scores.items(), key=lambda x: (-x[1], x[0]))[:k]]
+
+
+def _percentile(sorted_values: list[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def benchmark_agent(agent: dict, corpus: dict, k: int = 3, repeats: int = 1) -> BenchmarkMetrics | None:
+    """Index the corpus with the agent's stand-in and time every query. None if no adapter fits."""
+    adapter = adapter_for(agent)
+    if adapter is None:
+        return None
+    t0 = time.perf_counter()
+    adapter.index(corpus["documents"])
+    index_ms = (time.perf_counter() - t0) * 1000
+    latencies: list[float] = []
+    hits = 0
+    wall_start = time.perf_counter()
+    for _ in range(max(1, repeats)):
+        for q in corpus["queries"]:
+            start = time.perf_counter()
+            found = adapter.search(q["query"], k)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if set(found) & set(q["relevant_ids"]):
+                hits += 1
+    wall = time.perf_counter() - wall_start
+    latencies.sort()
+    return BenchmarkMetrics(
+        adapter=adapter.name,
+        queries=len(latencies),
+        top_k=k,
+        latency_p50_ms=round(_percentile(latencies, 50), 3),
+        latency_p95_ms=round(_percentile(latencies, 95), 3),
+        throughput_qps=round(len(latencies) / wall, 1) if wall > 0 else 0.0,
+        accuracy_retrieval=round(hits / len(latencies), 3) if latencies else 0.0,
+        index_ms=round(index_ms, 3),
+    )
+
+
+def enabled() -> bool:
+    """EXECUTION_MODE=benchmark makes the pipelines run the stand-ins and report measured metrics."""
+    return os.getenv("EXECUTION_MODE", "simulated").lower() == "benchmark"
+
+
+def run_candidates(agents: list[dict], use_case_id: str, use_case_name: str, **kwargs) -> dict[str, BenchmarkMetrics]:
+    """
+    Benchmark each candidate on one shared corpus for this use case. Keyed by agent name; agents without a
+    stand-in are left out. Results belong to this run only: pass them to registry.simulate_run explicitly.
+    """
+    corpus = build_fixture_corpus(use_case_id, use_case_name)
+    results = {}
+    for agent in agents:
+        measured = benchmark_agent(agent, corpus, **kwargs)
+        if measured is not None:
+            results[agent.get("name", "Unknown")] = measured
+    return results
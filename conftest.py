@@ -0,0 +1,38 @@
+"""Shared pytest fixtures. Handlers are registered on a stub app, so AgentField itself is not needed."""
+
+import pytest
+
+import reasoners
+import skills
+
+
+class StubApp:
+    """Just enough of agentfield.Agent for register(): decorators collect handlers; app.call has no provider."""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def _add(self, fn):
+        self.handlers[fn.__name__] = fn
+        return fn
+
+    def reasoner(self, fn=None, **_):
+        return self._add(fn) if fn is not None else self._add
+
+    def skill(self, **_):
+        return self._add
+
+    async def call(self, target, **kwargs):
+        raise ConnectionError(f"no control plane in tests ({target})")
+
+    async def ai(self, **kwargs):
+        raise ConnectionError("no LLM provider in tests")
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setenv("LLM_MAX_RETRIES", "0")
+    stub = StubApp()
+    skills.register(stub)
+    reasoners.register(stub)
+    return stub
@@ -0,0 +1,243 @@
+"""
+Resilient call layer for LLM-backed steps (app.ai behind app.call).
+Per-call deadlines, bounded retries with jitter, hedged requests for tail latency, and a circuit breaker
+that sends the pipeline straight to its rule-based fallback while the provider is unhealthy.
+"""
+
+import asyncio
+import os
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from schemas import CircuitBreakerState, LLMClientMetrics, LLMStepMetrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def env_float(name: str, default: float) -> float:
+    """Float env var; unset or unparseable -> default. Also used for the registry's AGENT_REGISTRY_* settings."""
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+# Errors a retry cannot fix: bad credentials, rejected or malformed requests, schema mismatches
+_NON_RETRYABLE_NAMES = ("AuthenticationError", "PermissionDeniedError", "BadRequestError", "NotFoundError", "UnprocessableEntityError")
+
+
+def _is_retryable(e: Exception) -> bool:
+    """Transient errors (timeouts, 5xx, 429, connection resets) are retried; client-side errors are not."""
+    if isinstance(e, (ValueError, TypeError, KeyError, AttributeError)):  # includes pydantic ValidationError
+        return False
+    if any(type(c).__name__ in _NON_RETRYABLE_NAMES for c in (e, e.__cause__) if c is not None):
+        return False
+    status = getattr(e, "status_code", None) or getattr(e, "status", None)
+    if isinstance(status, int) and 400 <= status < 500 and status not in (408, 429):
+        return False
+    return True
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: open after N failures, allow one probe after reset_after_s."""
+
+    def __init__(self, failure_threshold: int = 3, reset_after_s: float = 30.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_after_s = reset_after_s
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self.times_opened = 0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        """True if a call may go to the provider now."""
+        if self.state == OPEN:
+            if self.opened_at is not None and time.monotonic() - self.opened_at >= self.reset_after_s:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            else:
+                return False
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+        return True
+
+    def release(self) -> None:
+        """Give back a half-open probe slot without a verdict (the probe call was cancelled)."""
+        self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.times_opened += 1
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> CircuitBreakerState:
+        return CircuitBreakerState(
+            state=self.state,
+            consecutive_failures=self.consecutive_failures,
+            failure_threshold=self.failure_threshold,
+            reset_after_s=self.reset_after_s,
+            times_opened=self.times_opened,
+            open_for_s=round(time.monotonic() - self.opened_at, 3) if self.opened_at is not None else 0.0,
+        )
+
+
+class LLMClient:
+    """
+    Wrap an LLM-backed coroutine with deadline, retries, hedging and a shared circuit breaker.
+    Use one instance per agent so the breaker reflects provider health across all steps.
+    """
+
+    def __init__(
+        self,
+        attempt_timeout_s: float = 20.0,
+        deadline_s: float = 45.0,
+        max_retries: int = 2,
+        backoff_base_s: float = 0.25,
+        backoff_max_s: float = 4.0,
+        hedge_after_s: float | None = None,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self.attempt_timeout_s = attempt_timeout_s
+        self.deadline_s = deadline_s
+        self.max_retries = max(0, max_retries)
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.hedge_after_s = hedge_after_s
+        self.breaker = breaker or CircuitBreaker()
+        self._steps: dict[str, LLMStepMetrics] = {}
+
+    @classmethod
+    def from_env(cls) -> "LLMClient":
+        """Build from LLM_* env vars (see .env.example); unset vars keep the defaults."""
+        hedge = env_float("LLM_HEDGE_AFTER_S", 0.0)
+        return cls(
+            attempt_timeout_s=env_float("LLM_ATTEMPT_TIMEOUT_S", 20.0),
+            deadline_s=env_float("LLM_DEADLINE_S", 45.0),
+            max_retries=int(env_float("LLM_MAX_RETRIES", 2)),
+            hedge_after_s=hedge if hedge > 0 else None,
+            breaker=CircuitBreaker(
+                failure_threshold=int(env_float("LLM_BREAKER_FAILURES", 3)),
+                reset_after_s=env_float("LLM_BREAKER_RESET_S", 30.0),
+            ),
+        )
+
+    def _step(self, step: str) -> LLMStepMetrics:
+        if step not in self._steps:
+            self._steps[step] = LLMStepMetrics(step=step)
+        return self._steps[step]
+
+    def _backoff(self, attempt: int) -> float:
+        """Full jitter: uniform(0, min(max, base * 2**attempt))."""
+        return random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * (2**attempt)))
+
+    async def _attempt(self, factory: Callable[[], Awaitable[Any]], m: LLMStepMetrics) -> Any:
+        """One attempt, optionally hedged: a second copy starts if the first is slower than hedge_after_s."""
+        primary = asyncio.ensure_future(asyncio.wait_for(factory(), self.attempt_timeout_s))
+        if self.hedge_after_s is None or self.hedge_after_s >= self.attempt_timeout_s:
+            return await primary
+        pending = {primary}
+        hedge = None
+        error: BaseException | None = None
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.hedge_after_s)
+            if done:
+                return primary.result()
+            m.hedges_launched += 1
+            hedge = asyncio.ensure_future(asyncio.wait_for(factory(), self.attempt_timeout_s))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            m.hedges_won += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def call(
+        self,
+        step: str,
+        factory: Callable[[], Awaitable[Any]],
+        fallback: Callable[[], Any],
+    ) -> Any:
+        """
+        Run factory() under the resilience policy; return fallback() if the breaker is open
+        or every attempt failed within the deadline. factory must create a fresh coroutine per call.
+        """
+        m = self._step(step)
+        m.calls += 1
+        if not self.breaker.allow():
+            m.short_circuited += 1
+            m.fallbacks += 1
+            return fallback()
+        start = time.monotonic()
+        deadline = start + self.deadline_s
+        try:
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    m.retries += 1
+                try:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError
+                    result = await asyncio.wait_for(self._attempt(factory, m), remaining)
+                except asyncio.TimeoutError:
+                    m.timeouts += 1
+                    m.last_error = f"TimeoutError: no answer within {min(self.attempt_timeout_s, self.deadline_s)}s"
+                    retryable = True
+                except Exception as e:
+                    m.failures += 1
+                    m.last_error = f"{type(e).__name__}: {e}"[:200]
+                    retryable = _is_retryable(e)
+                else:
+                    m.successes += 1
+                    m.last_latency_ms = round((time.monotonic() - start) * 1000, 1)
+                    self.breaker.record_success()
+                    return result
+                if not retryable or self.breaker.state == OPEN or attempt == self.max_retries:
+                    break
+                delay = self._backoff(attempt)
+                if time.monotonic() + delay >= deadline:
+                    break
+                await asyncio.sleep(delay)
+        except BaseException:
+            # Cancelled (e.g. by the control plane): free a half-open probe slot so the breaker can't stick
+            self.breaker.release()
+            raise
+        # One failed call counts once, however many attempts it made
+        self.breaker.record_failure()
+        m.fallbacks += 1
+        m.last_latency_ms = round((time.monotonic() - start) * 1000, 1)
+        return fallback()
+
+    def metrics(self) -> LLMClientMetrics:
+        """Current breaker state, policy and per-step counters."""
+        return LLMClientMetrics(
+            breaker=self.breaker.snapshot(),
+            attempt_timeout_s=self.attempt_timeout_s,
+            deadline_s=self.deadline_s,
+            max_retries=self.max_retries,
+            hedge_after_s=self.hedge_after_s,
+            steps=[s.model_copy() for s in self._steps.values()],
+        )
@@ -9,6 +9,7 @@ load_dotenv()
 from agentfield import Agent, AIConfig
 
 from reasoners import register as register_reasoners
+from serialization import response_class
 from skills import register as register_skills
 
 app = Agent(
@@ -20,6 +21,7 @@ app = Agent(
         model=os.getenv("OPENAI_MODEL", "openai/gpt-4o"),
         temperature=0,  # deterministic
     ),
+    default_response_class=response_class(),  # orjson-backed when installed; FAST_JSON=0 to disable
 )
 
 # Fix 422 "Missing required field: inp": control plane sends {"input": {...}} but the agent
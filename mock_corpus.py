@@ -0,0 +1,223 @@
+"""
+Seeded, streaming synthetic corpus behind generate_mock_data: support tickets, ESG policy documents, evidence files.
+Record i depends only on (use_case_id, seed, i), so corpora are reproducible across processes and can be
+generated lazily; write_corpus streams them to chunked JSONL with memory bounded by one record.
+"""
+
+import json
+import math
+import os
+import random
+import shutil
+import threading
+import uuid
+from collections.abc import Iterator
+from pathlib import Path
+
+from schemas import CorpusManifest
+
+KINDS = ("ticket", "policy", "evidence")
+_BLOCK = 1024
+
+# One writer per corpus directory in this process; concurrent generate_mock_data calls would otherwise race
+_WRITE_LOCKS: dict[Path, threading.Lock] = {}
+_WRITE_LOCKS_GUARD = threading.Lock()
+
+# Topic vocabularies; every record draws one topic so search and gap analysis have something to match on
+TOPICS = [
+    "scope emissions supplier carbon inventory baseline",
+    "water withdrawal discharge basin stress permit",
+    "board oversight governance committee charter independence",
+    "diversity workforce hiring retention equity pay",
+    "waste landfill recycling hazardous diversion circular",
+    "energy renewable consumption grid efficiency intensity",
+    "biodiversity habitat land restoration species impact",
+    "human rights supply chain audit forced labour",
+    "anticorruption bribery whistleblower ethics training",
+    "climate risk scenario transition physical adaptation",
+    "integration api webhook connector sync onboarding",
+    "support ticket escalation priority triage resolution",
+]
+_FRAMEWORKS = ["GRI", "CSRD/ESRS", "TCFD", "SASB", "ISSB"]
+_CUSTOMERS = ["Acme Corp", "Globex", "Initech", "Umbrella", "Stark Industries", "Wayne Enterprises", "Hooli"]
+_PRIORITIES = ["low", "medium", "high", "urgent"]
+_UNITS = ["tCO2e", "m3", "MWh", "t", "%", "count"]
+_FORMATS = {
+    "ticket": ["txt", "html", "md"],
+    "policy": ["pdf", "docx", "html", "md"],
+    "evidence": ["csv", "xlsx", "pdf"],
+}
+_KIND_HINTS = {
+    "ticket": ("ticket", "support", "triage", "integration", "helpdesk", "customer"),
+    "policy": ("esg", "policy", "policies", "compliance", "gap", "report", "document", "regulat"),
+    "evidence": ("esg", "evidence", "audit", "compliance", "gap", "report", "metric"),
+}
+
+
+def kinds_for(use_case_id: str, use_case_name: str) -> list[str]:
+    """Record kinds that fit the use case (keyword match); all kinds if nothing matches."""
+    text = f"{use_case_id} {use_case_name}".lower()
+    kinds = [k for k in KINDS if any(h in text for h in _KIND_HINTS[k])]
+    return kinds or list(KINDS)
+
+
+def _record(rng: random.Random, use_case_id: str, use_case_name: str, kind: str, i: int) -> dict:
+    topic = TOPICS[rng.randrange(len(TOPICS))].split()
+    words = rng.sample(topic, 4)
+    rec = {"id": f"{use_case_id}-{kind}-{i}", "kind": kind, "format": rng.choice(_FORMATS[kind])}
+    if kind == "ticket":
+        rec["subject"] = f"{words[0].capitalize()} {words[1]} issue"
+        rec["body"] = f"Need help with {' '.join(words[1:])} for {use_case_name}. Ref sec{i:07d}."
+        rec["priority"] = rng.choice(_PRIORITIES)
+        rec["customer"] = rng.choice(_CUSTOMERS)
+        rec["created_at"] = f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        rec["text"] = f"{rec['subject']}. {rec['body']}"
+    elif kind == "policy":
+        rec["framework"] = rng.choice(_FRAMEWORKS)
+        rec["title"] = f"{rec['framework']} {words[0]} {words[1]} policy"
+        rec["section"] = f"{rng.randint(1, 12)}.{rng.randint(1, 9)}"
+        rec["text"] = (
+            f"Section {rec['section']} sec{i:07d}: the company shall disclose {words[0]} and {words[1]}, "
+            f"covering {words[2]} and {words[3]} ({use_case_name})."
+        )
+    else:
+        rec["title"] = f"{words[0].capitalize()} {words[1]} evidence"
+        rec["metric"] = f"{words[0]}_{words[1]}"
+        rec["value"] = round(rng.uniform(0, 10000), 2)
+        rec["unit"] = rng.choice(_UNITS)
+        rec["period"] = f"FY{rng.randint(2021, 2025)}"
+        rec["text"] = f"{rec['title']} sec{i:07d}: {rec['metric']} = {rec['value']} {rec['unit']} for {rec['period']}; {' '.join(words[2:])}."
+    return rec
+
+
+def iter_records(use_case_id: str, use_case_name: str, n_records: int, seed: int = 0, start: int = 0) -> Iterator[dict]:
+    """Lazily yield records start..n_records-1. Same (use_case_id, seed, i) -> same record."""
+    kinds = kinds_for(use_case_id, use_case_name)
+    # One RNG per block of records: seeding is costly, and any block can still be regenerated on its own
+    for block in range(start // _BLOCK, math.ceil(n_records / _BLOCK)):
+        rng = random.Random(f"{use_case_id}:{seed}:{block}")
+        for i in range(block * _BLOCK, min(n_records, (block + 1) * _BLOCK)):
+            rec = _record(rng, use_case_id, use_case_name, kinds[i % len(kinds)], i)
+            if i >= start:
+                yield rec
+
+
+def corpus_root() -> Path:
+    """MOCK_CORPUS_DIR, default ./mock_corpus next to this module. All corpora are written below it."""
+    return Path(os.getenv("MOCK_CORPUS_DIR") or Path(__file__).resolve().parent / "mock_corpus").resolve()
+
+
+def default_corpus_dir(use_case_id: str, seed: int) -> Path:
+    """corpus_root() / <use_case_id>-s<seed>."""
+    safe_id = "".join(c if c.isalnum() or c in "-_" else "_" for c in use_case_id)
+    return corpus_root() / f"{safe_id}-s{seed}"
+
+
+def resolve_corpus_dir(out_dir: str | Path | None, use_case_id: str, seed: int) -> Path:
+    """out_dir relative to corpus_root(); ValueError if it resolves outside it (out_dir comes from requests)."""
+    if not out_dir:
+        return default_corpus_dir(use_case_id, seed)
+    root = corpus_root()
+    out = (root / out_dir).resolve()
+    if out == root or not out.is_relative_to(root):
+        raise ValueError(f"out_dir must be a subdirectory of {root}: {out_dir!r}")
+    return out
+
+
+def _write_lock(out: Path) -> threading.Lock:
+    with _WRITE_LOCKS_GUARD:
+        return _WRITE_LOCKS.setdefault(out, threading.Lock())
+
+
+def _read_manifest(out: Path) -> CorpusManifest | None:
+    try:
+        return CorpusManifest.model_validate_json((out / "manifest.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):  # missing, unreadable or not ours: treat as stale
+        return None
+
+
+def _is_corpus_file(path: Path) -> bool:
+    return path.name == "manifest.json" or (path.name.startswith("part-") and path.suffix == ".jsonl")
+
+
+def _sibling(out: Path, tag: str) -> Path:
+    """Unused hidden path next to out (same filesystem, so renames are atomic)."""
+    return out.parent / f".{out.name}.{tag}-{uuid.uuid4().hex[:12]}"
+
+
+def _install(tmp: Path, out: Path) -> None:
+    """Move the finished corpus in tmp to out with directory renames; anything else already in out is kept."""
+    if not out.exists():
+        os.replace(tmp, out)
+        return
+    old = _sibling(out, "old")
+    os.replace(out, old)
+    os.replace(tmp, out)
+    for entry in old.iterdir():
+        if not _is_corpus_file(entry):
+            os.replace(entry, out / entry.name)
+    shutil.rmtree(old)
+
+
+def write_corpus(
+    use_case_id: str,
+    use_case_name: str,
+    n_records: int,
+    seed: int = 0,
+    chunk_size: int = 10000,
+    out_dir: str | Path | None = None,
+) -> CorpusManifest:
+    """
+    Stream the corpus to out_dir/part-NNNNN.jsonl, chunk_size records per file, plus manifest.json.
+    out_dir is taken relative to MOCK_CORPUS_DIR and may not leave it.
+    An existing manifest with the same parameters is reused; otherwise the corpus is written to a temporary
+    sibling directory and renamed into place, so out_dir never holds a half-written or mixed corpus.
+    """
+    out = resolve_corpus_dir(out_dir, use_case_id, seed)
+    chunk_size = max(1, chunk_size)
+    with _write_lock(out):
+        existing = _read_manifest(out)
+        params = existing and (existing.use_case_id, existing.use_case_name, existing.n_records, existing.seed, existing.chunk_size)
+        if params == (use_case_id, use_case_name, n_records, seed, chunk_size):
+            return existing
+        out.parent.mkdir(parents=True, exist_ok=True)
+        tmp = _sibling(out, "tmp")
+        tmp.mkdir()
+        try:
+            files: list[str] = []
+            f = None
+            try:
+                for i, rec in enumerate(iter_records(use_case_id, use_case_name, n_records, seed)):
+                    if i % chunk_size == 0:
+                        if f is not None:
+                            f.close()
+                        files.append(f"part-{len(files):05d}.jsonl")
+                        f = open(tmp / files[-1], "w", encoding="utf-8")
+                    f.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n")
+            finally:
+                if f is not None:
+                    f.close()
+            manifest = CorpusManifest(
+                use_case_id=use_case_id,
+                use_case_name=use_case_name,
+                path=str(out),
+                files=files,
+                n_records=n_records,
+                chunk_size=chunk_size,
+                seed=seed,
+                kinds=kinds_for(use_case_id, use_case_name),
+                bytes=sum((tmp / name).stat().st_size for name in files),
+            )
+            (tmp / "manifest.json").write_text(manifest.model_dump_json(indent=2), encoding="utf-8")
+            _install(tmp, out)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)  # only left over if writing failed
+    return manifest
+
+
+def read_corpus(manifest: CorpusManifest) -> Iterator[dict]:
+    """Stream records back from a written corpus, one chunk file at a time."""
+    for name in manifest.files:
+        with open(Path(manifest.path) / name, encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
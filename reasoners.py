@@ -1,11 +1,17 @@
 """AI reasoners: analyse product, search agents, test with mock data, build notification report. All use temperature=0 + schema."""
 
+import asyncio
+from pathlib import Path
+
+import benchmark
 import registry
+from llm_client import LLMClient
 from schemas import (
     AgentTestResult,
     AgenticOpportunitiesOut,
     AgentsFoundOut,
     EvalResult,
+    LLMClientMetrics,
     NotificationReport,
     ProductDescription,
     RecommendationOut,
@@ -19,6 +25,9 @@ from schemas import (
 def register(app):
     """Register reasoner handlers on the given Agent. Call from main.py after creating app."""
 
+    # One client per agent: the circuit breaker tracks provider health across all LLM-backed steps
+    llm = LLMClient.from_env()
+
     def _is_envelope(d: dict) -> bool:
         """True if this looks like an execution envelope, not the actual result."""
         return isinstance(d, dict) and ("execution_id" in d or "run_id" in d or ("status" in d and "result" in d))
@@ -54,11 +63,12 @@ def register(app):
         product: ProductDescription,
         opportunities: AgenticOpportunitiesOut | None = None,
     ) -> AgentsFoundOut:
-        """Search the agent registry (agent_registry.json) for agents matching the product and opportunities."""
+        """Search the agent registry (agent_registry.json, or all AGENT_REGISTRY_SOURCES shards) for agents matching the product and opportunities."""
         if isinstance(product, dict):
             product = ProductDescription(**product)
         opp_list = (opportunities.get("opportunities") if isinstance(opportunities, dict) else getattr(opportunities, "opportunities", None)) or []
-        registry_agents = registry.search_registry(
+        registry_agents = await asyncio.to_thread(
+            registry.search_registry,
             product_name=product.name,
             product_domain=product.domain,
             one_liner=product.one_liner,
@@ -66,12 +76,13 @@ def register(app):
             max_agents=4,
         )
         if not registry_agents:
-            registry_agents = registry.load_registry()[:3]
+            registry_agents = (await asyncio.to_thread(registry.load_registry))[:3]
         agents = [
             {"name": a.get("name", "Unknown"), "reason_relevant": (a.get("description", "") or "From registry.")[:120], "category": a.get("category", "file-search")}
             for a in registry_agents
         ]
-        return AgentsFoundOut(agents=agents, search_context="Searched agent_registry.json (simulated repository of new agents).")
+        sources = ", ".join(Path(src).name if "://" not in src else src for src in registry.registry_sources())
+        return AgentsFoundOut(agents=agents, search_context=f"Searched {sources} (simulated repository of new agents).")
 
     # --- Step 3b: Legacy LLM search ---
     @app.reasoner
@@ -173,6 +184,11 @@ def register(app):
             schema=ReportInsights,
         )
 
+    @app.reasoner
+    async def llm_client_metrics() -> LLMClientMetrics:
+        """Circuit breaker state, call policy and per-step retry/hedge/fallback counters of the LLM call layer."""
+        return llm.metrics()
+
     # --- Hackathon demo: same flow but skip LLM analyse (use fixed opportunities). Fast, works without API key. ---
     @app.reasoner
     async def evaluate_pipeline_demo(product: ProductDescription) -> NotificationReport:
@@ -187,7 +203,8 @@ def register(app):
             "summary": "Agentic AI fits document search, gap analysis, and compliance evidence retrieval.",
         }
         opportunities_summary = opps["summary"]
-        registry_agents = registry.search_registry(
+        registry_agents = await asyncio.to_thread(
+            registry.search_registry,
             product_name=product.name,
             product_domain=product.domain,
             one_liner=product.one_liner,
@@ -195,26 +212,29 @@ def register(app):
             max_agents=4,
         )
         if not registry_agents:
-            registry_agents = registry.load_registry()[:3]
+            registry_agents = (await asyncio.to_thread(registry.load_registry))[:3]
         use_case_name = opps["opportunities"][0]["title"]
+        measured = {}
+        if benchmark.enabled():
+            measured = await asyncio.to_thread(benchmark.run_candidates, registry_agents, opps["opportunities"][0]["id"], use_case_name)
         agents_tested = []
         for agent in registry_agents:
             agent_name = agent.get("name", "Unknown")
-            eval_result = registry.simulate_run(agent, use_case_name)
-            eval_result_dict = eval_result.model_dump()
+            eval_result = registry.simulate_run(agent, use_case_name, measured.get(agent_name))
             adopt = eval_result.overall_score >= 0.75
-            agents_tested.append({
-                "agent_name": agent_name,
-                "eval_result": eval_result_dict,
-                "adopt_recommended": adopt,
-                "reasoning": f"Simulated overall score {eval_result.overall_score:.2f}; recommend adopt for score ≥ 0.75.",
-            })
+            # Every field is built here from a validated EvalResult: construct without re-validating
+            agents_tested.append(AgentTestResult.model_construct(
+                agent_name=agent_name,
+                eval_result=eval_result,
+                adopt_recommended=adopt,
+                reasoning=f"Simulated overall score {eval_result.overall_score:.2f}; recommend adopt for score ≥ 0.75.",
+            ))
         overall_insights = f"From registry: {', '.join(a['name'] for a in registry_agents)}. Best fit for '{use_case_name}' based on simulated completeness, determinism, and fit."
-        notification_message = f"Demo report for {product.name}: {sum(1 for a in agents_tested if a['adopt_recommended'])} of {len(agents_tested)} agents recommended for adoption (score ≥ 0.75)."
-        return NotificationReport(
+        notification_message = f"Demo report for {product.name}: {sum(1 for a in agents_tested if a.adopt_recommended)} of {len(agents_tested)} agents recommended for adoption (score ≥ 0.75)."
+        return NotificationReport.model_construct(
             product_name=product.name,
             opportunities_summary=opportunities_summary,
-            agents_tested=[AgentTestResult(**a) for a in agents_tested],
+            agents_tested=agents_tested,
             overall_insights=overall_insights,
             notification_message=notification_message,
         )
@@ -239,13 +259,11 @@ def register(app):
             ],
             "summary": "Agentic AI fits document search, gap analysis, and compliance evidence retrieval.",
         }
-        try:
-            opps = _unwrap(await app.call(
-                f"{node}.analyse_agentic_opportunities",
-                product=product.model_dump(),
-            ))
-        except Exception:
-            opps = fallback_opps
+        opps = _unwrap(await llm.call(
+            "analyse_agentic_opportunities",
+            lambda: app.call(f"{node}.analyse_agentic_opportunities", product=product.model_dump()),
+            fallback=lambda: fallback_opps,
+        ))
         if not opps.get("opportunities"):
             opps = fallback_opps
         opportunities_summary = opps.get("summary", "Agentic AI opportunities identified.")
@@ -259,7 +277,8 @@ def register(app):
         print()
 
         # Step 3: Search simulated agent registry (repository of new agents)
-        registry_agents = registry.search_registry(
+        registry_agents = await asyncio.to_thread(
+            registry.search_registry,
             product_name=product.name,
             product_domain=product.domain,
             one_liner=product.one_liner,
@@ -267,9 +286,9 @@ def register(app):
             max_agents=4,
         )
         if not registry_agents:
-            registry_agents = registry.load_registry()[:3]
+            registry_agents = (await asyncio.to_thread(registry.load_registry))[:3]
         print("\n" + "=" * 60 + "\n[STEP 3] Agents from registry (search result)\n" + "=" * 60)
-        print("  source: agent_registry.json (simulated repository)")
+        print(f"  sources: {', '.join(registry.registry_sources())} (simulated repository)")
         for a in registry_agents:
             print(f"  - {a.get('name')} ({a.get('category')}) [{a.get('released')}]: {a.get('description', '')[:60]}...")
         print()
@@ -279,48 +298,60 @@ def register(app):
         use_case_id = first_opp.get("id", "o1")
         use_case_name = first_opp.get("title", first_opp.get("name", "Default"))
 
+        # Optional: run each candidate's local stand-in; measured numbers are reported next to the Step 4 scores
+        measured = {}
+        if benchmark.enabled():
+            measured = await asyncio.to_thread(benchmark.run_candidates, registry_agents, use_case_id, use_case_name)
+            print("\n" + "=" * 60 + "\n[STEP 3b] Local benchmark (EXECUTION_MODE=benchmark)\n" + "=" * 60)
+            for name, m in measured.items():
+                print(f"  - {name}: p50={m.latency_p50_ms}ms p95={m.latency_p95_ms}ms qps={m.throughput_qps} accuracy={m.accuracy_retrieval}")
+            print()
+
         # Step 4: Simulate run for each agent from registry → AI verdict
         agents_tested = []
         for agent in registry_agents:
             agent_name = agent.get("name", "Unknown")
-            eval_result = registry.simulate_run(agent, use_case_name)
+            eval_result = registry.simulate_run(agent, use_case_name, measured.get(agent_name))
             eval_result_dict = eval_result.model_dump()
-            try:
-                recommendation = _unwrap(await app.call(
+            recommendation = _unwrap(await llm.call(
+                "recommend_adoption",
+                lambda: app.call(
                     f"{node}.recommend_adoption",
                     inp={"framework_name": agent_name, "eval_result": eval_result_dict},
-                ))
-            except Exception:
-                recommendation = {
+                ),
+                fallback=lambda: {
                     "adopt_worthwhile": eval_result.overall_score >= 0.75,
                     "reasoning": f"Simulated overall score {eval_result.overall_score}; adopt if score ≥ 0.75.",
-                }
-            agents_tested.append({
-                "agent_name": agent_name,
-                "eval_result": eval_result_dict,
-                "adopt_recommended": recommendation.get("adopt_worthwhile", False),
-                "reasoning": recommendation.get("reasoning", ""),
-            })
+                },
+            ))
+            # Validate the LLM verdict once here; the EvalResult instance is not re-validated
+            agents_tested.append(AgentTestResult(
+                agent_name=agent_name,
+                eval_result=eval_result,
+                adopt_recommended=recommendation.get("adopt_worthwhile", False),
+                reasoning=recommendation.get("reasoning", ""),
+            ))
             # --- PRINT per-agent: registry metrics, simulated scores, verdict ---
             m = agent.get("metrics") or {}
             print("\n" + "-" * 60 + f"\n[STEP 4] Agent: {agent_name}\n" + "-" * 60)
             print("  registry metrics:", {k: v for k, v in m.items()})
             print("  best_for:", agent.get("best_for", []))
-            e = eval_result_dict
-            print(f"  simulated scores: completeness={e.get('score_completeness')}, determinism={e.get('score_determinism')}, fit={e.get('score_fit')}, overall={e.get('overall_score')}")
+            e = eval_result
+            print(f"  simulated scores: completeness={e.score_completeness}, determinism={e.score_determinism}, fit={e.score_fit}, overall={e.overall_score}")
             print(f"  AI verdict: adopt_recommended={recommendation.get('adopt_worthwhile')}; reasoning: {recommendation.get('reasoning', '')}")
 
         # Step 5: Build notification report (performance insights + why adopt or not)
-        try:
-            insights_raw = await app.call(
+        insights_raw = await llm.call(
+            "build_notification_report",
+            lambda: app.call(
                 f"{node}.build_notification_report",
                 product_name=product.name,
                 opportunities_summary=opportunities_summary,
-                agents_tested=agents_tested,
-            )
-            insights = _unwrap(insights_raw) if isinstance(insights_raw, dict) else {}
-        except Exception:
-            insights = {}
+                agents_tested=[a.model_dump() for a in agents_tested],
+            ),
+            fallback=dict,
+        )
+        insights = _unwrap(insights_raw) if isinstance(insights_raw, dict) else {}
         if not isinstance(insights, dict):
             insights = {}
         overall_insights = insights.get("overall_insights") or "Performance insights across tested agents."
@@ -329,19 +360,11 @@ def register(app):
         print(f"  overall_insights: {overall_insights}")
         print(f"  notification_message: {notification_message}\n" + "=" * 60 + "\n")
 
-        # Ensure each agent's eval_result is EvalResult-shaped (already normalized above; _safe_agent_result as fallback)
-        def _safe_agent_result(a: dict) -> dict:
-            er = a.get("eval_result") or {}
-            if isinstance(er, dict) and _is_envelope(er):
-                er = _ensure_eval_result(er).model_dump()
-            elif isinstance(er, dict) and ("framework_name" not in er or "overall_score" not in er):
-                er = _ensure_eval_result(er).model_dump()
-            return {**a, "eval_result": er}
-
+        # LLM-sourced strings are validated here; agents_tested are already AgentTestResult instances
         return NotificationReport(
             product_name=product.name,
             opportunities_summary=opportunities_summary,
-            agents_tested=[AgentTestResult(**_safe_agent_result(a)) for a in agents_tested],
+            agents_tested=agents_tested,
             overall_insights=overall_insights,
             notification_message=notification_message,
         )
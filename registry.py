@@ -1,51 +1,189 @@
 """
 Simulated agent registry: load, search, and simulate a run from metrics.
 Used when we can't connect to real agents — search this "repository" and derive performance from metrics.
+The registry can be federated over several shards (vendor catalogues as local files or HTTP URLs, set in
+AGENT_REGISTRY_SOURCES); searches scatter to every shard in parallel and merge the per-shard top-k.
 """
 
 import json
+import os
+import threading
+import time
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
 
-from schemas import EvalResult
+from llm_client import env_float
+from schemas import BenchmarkMetrics, EvalResult
 
-_REGISTRY: list[dict] | None = None
+_MODULE_DIR = Path(__file__).resolve().parent
+
+# source -> (loaded_at, agents). File shards are cached for the process; URL shards are refreshed after AGENT_REGISTRY_TTL_S
+_SHARDS: dict[str, tuple[float, list[dict]]] = {}
+# One fetch in flight per source, on one shared pool: a slow shard never gets more than one thread
+_INFLIGHT: dict[str, Future] = {}
+_LOCK = threading.Lock()
+_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="registry-shard")
 
 
 def _registry_path() -> Path:
-    return Path(__file__).resolve().parent / "agent_registry.json"
+    return _MODULE_DIR / "agent_registry.json"
 
 
-def load_registry() -> list[dict]:
-    """Load the simulated agent registry from agent_registry.json."""
-    global _REGISTRY
-    if _REGISTRY is not None:
-        return _REGISTRY
-    path = _registry_path()
-    if not path.exists():
-        return []
-    with open(path, encoding="utf-8") as f:
-        data = json.load(f)
-    _REGISTRY = data.get("agents") or []
-    return _REGISTRY
+def _is_url(source: str) -> bool:
+    return source.startswith(("http://", "https://"))
 
 
-def search_registry(
-    product_name: str,
-    product_domain: str,
-    one_liner: str,
-    opportunities: list[dict] | None = None,
-    max_agents: int = 4,
-) -> list[dict]:
+def registry_sources() -> list[str]:
     """
-    Search the registry for agents relevant to the product and opportunities.
-    Uses keyword overlap on category, best_for, features, and description.
-    Returns list of full agent dicts (with metrics) for simulation.
+    Shard sources from AGENT_REGISTRY_SOURCES (comma-separated paths or http(s) URLs); default agent_registry.json.
+    Relative paths resolve against this module's directory, like the default. Duplicates are listed once.
     """
-    agents = load_registry()
-    if not agents:
-        return []
+    raw = os.getenv("AGENT_REGISTRY_SOURCES", "")
+    sources = [s.strip() for s in raw.split(",") if s.strip()]
+    resolved = [s if _is_url(s) else str((_MODULE_DIR / s).resolve()) for s in sources]
+    return list(dict.fromkeys(resolved)) or [str(_registry_path())]
+
+
+def _is_str_list(value) -> bool:
+    return isinstance(value, list) and all(isinstance(v, str) for v in value)
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _agent_problem(agent: dict) -> str | None:
+    """Why a catalogue entry can't be searched or scored, or None if it can. Shards are untrusted input."""
+    if not isinstance(agent.get("name"), str):
+        return "name must be a string"
+    for key in ("id", "category", "description"):
+        if key in agent and not isinstance(agent[key], str):
+            return f"{key} must be a string"
+    for key in ("features", "best_for"):
+        if key in agent and not _is_str_list(agent[key]):
+            return f"{key} must be a list of strings"
+    metrics = agent.get("metrics")
+    if metrics is None:
+        return None
+    if not isinstance(metrics, dict):
+        return "metrics must be an object"
+    for key in ("latency_p95_ms", "accuracy_retrieval", "max_context_tokens"):
+        if key in metrics and not _is_number(metrics[key]):
+            return f"metrics.{key} must be a number"
+    if "file_formats" in metrics and not _is_str_list(metrics["file_formats"]):
+        return "metrics.file_formats must be a list of strings"
+    return None
+
+
+def _fetch(source: str) -> list[dict]:
+    """
+    Read one shard (same {"agents": [...]} document as agent_registry.json) into the cache. Failure -> last good copy or [].
+    Malformed agent entries are logged and dropped; the rest of the shard is kept.
+    """
+    cached = _SHARDS.get(source)
+    try:
+        if _is_url(source):
+            # Fetch timeout is longer than the search deadline so a slow shard still fills the cache in the background
+            with urllib.request.urlopen(source, timeout=env_float("AGENT_REGISTRY_FETCH_TIMEOUT_S", 10.0)) as resp:
+                data = json.load(resp)
+        else:
+            path = Path(source)
+            if not path.exists():
+                return []
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        agents = data.get("agents") if isinstance(data, dict) else None
+        if not isinstance(agents, list) or not all(isinstance(a, dict) for a in agents):
+            raise ValueError('expected a {"agents": [...]} document')
+    except (OSError, ValueError) as e:
+        print(f"[registry] shard {source} unavailable: {e}")
+        return cached[1] if cached else []
+    valid = []
+    for i, agent in enumerate(agents):
+        problem = _agent_problem(agent)
+        if problem:
+            # One bad entry drops only itself, not the shard (or every search)
+            print(f"[registry] shard {source}: skipping agent #{i} ({agent.get('name')!r}): {problem}")
+            continue
+        agent.setdefault("shard", source)
+        valid.append(agent)
+    agents = valid
+    _SHARDS[source] = (time.monotonic(), agents)
+    return agents
+
+
+def _shard_future(source: str) -> Future:
+    """
+    Future for a shard's agents. Fresh cache -> already resolved. Expired URL shard -> the stale copy now,
+    with a refresh in the background. Otherwise the (shared) in-flight fetch.
+    """
+    cached = _SHARDS.get(source)
+    fresh = cached is not None and (not _is_url(source) or time.monotonic() - cached[0] < env_float("AGENT_REGISTRY_TTL_S", 300.0))
+    if not fresh:
+        with _LOCK:
+            fut = _INFLIGHT.get(source)
+            if fut is None:
+                fut = _POOL.submit(_fetch, source)
+                _INFLIGHT[source] = fut
+                fut.add_done_callback(lambda f, src=source: _INFLIGHT.pop(src, None) if _INFLIGHT.get(src) is f else None)
+        if cached is None:
+            return fut
+    done: Future = Future()
+    done.set_result(cached[1])
+    return done
+
+
+def load_shard(source: str) -> list[dict]:
+    """Blocking load of one shard. Missing or unreachable -> []."""
+    return _shard_future(source).result()
+
+
+def _gather(sources: list[str], timeout_s: float) -> list[list[dict] | None]:
+    """
+    Agents of every shard in shard order, fetched in parallel; None for shards that missed the timeout.
+    Slow shards are not waited for: their fetch finishes in the background and fills the cache.
+    """
+    futures = [_shard_future(src) for src in sources]
+    wait(futures, timeout=timeout_s)
+    results = []
+    for src, fut in zip(sources, futures):
+        if fut.done() and fut.exception() is None:
+            results.append(fut.result())
+        else:
+            print(f"[registry] shard {src} skipped: {'timed out' if not fut.done() else fut.exception()}")
+            results.append(None)
+    return results
+
 
-    # Build query tokens from product and opportunities
+def _agent_key(agent: dict) -> str:
+    """Identity across shards: id, else name. Vendor catalogues overlap, so the same agent can appear in several."""
+    return agent.get("id") or agent["name"]
+
+
+def _unique(agents: list[dict]) -> list[dict]:
+    """First occurrence of each agent, order kept."""
+    seen: set[str] = set()
+    out = []
+    for agent in agents:
+        key = _agent_key(agent)
+        if key not in seen:
+            seen.add(key)
+            out.append(agent)
+    return out
+
+
+def load_registry() -> list[dict]:
+    """
+    Load all registry shards (agent_registry.json by default) and concatenate them in source order,
+    keeping the first copy of agents listed in several shards. Blocking.
+    """
+    shards = _gather(registry_sources(), env_float("AGENT_REGISTRY_SHARD_TIMEOUT_S", 2.0))
+    return _unique([a for agents in shards if agents for a in agents])
+
+
+def _query_tokens(product_name: str, product_domain: str, one_liner: str, opportunities: list[dict] | None) -> set[str]:
+    """Build query tokens from product and opportunities."""
     tokens = set()
     for s in (product_name, product_domain, one_liner or ""):
         for w in (s or "").lower().replace(",", " ").replace(".", " ").split():
@@ -58,44 +196,82 @@ def search_registry(
                 for w in val.lower().replace(",", " ").split():
                     if len(w) > 2:
                         tokens.add(w)
+    return tokens
 
-    scored: list[tuple[float, dict]] = []
-    for agent in agents:
-        score = 0.0
-        searchable = " ".join(
-            [
-                agent.get("name", ""),
-                agent.get("category", ""),
-                agent.get("description", ""),
-                " ".join(agent.get("features", [])),
-                " ".join(agent.get("best_for", [])),
-            ]
-        ).lower()
-        for t in tokens:
-            if t in searchable:
-                score += 1.0
-        # Prefer agents whose best_for or category explicitly match
-        best_for = [b.lower() for b in agent.get("best_for", [])]
-        for t in tokens:
-            if any(t in b for b in best_for):
-                score += 2.0
-        if agent.get("category", "").lower() in ("file-search", "rag") and any(
-            w in ("file", "search", "document", "esg", "compliance", "gap") for w in tokens
-        ):
-            score += 1.5
-        scored.append((score, agent))
-
-    scored.sort(key=lambda x: -x[0])
-    # Return at least top 2 if any score > 0, else top 2 by default for demo
-    if not scored or scored[0][0] <= 0:
-        return agents[:max_agents]
-    return [a for _, a in scored[: max(2, max_agents)]]
-
-
-def simulate_run(agent: dict, use_case_name: str) -> EvalResult:
+
+def score_agent(agent: dict, tokens: set[str]) -> float:
+    """
+    Keyword overlap on name, category, description, features and best_for.
+    Depends only on the agent and the query, so scores from different shards are comparable.
+    """
+    score = 0.0
+    searchable = " ".join(
+        [
+            agent.get("name", ""),
+            agent.get("category", ""),
+            agent.get("description", ""),
+            " ".join(agent.get("features", [])),
+            " ".join(agent.get("best_for", [])),
+        ]
+    ).lower()
+    for t in tokens:
+        if t in searchable:
+            score += 1.0
+    # Prefer agents whose best_for or category explicitly match
+    best_for = [b.lower() for b in agent.get("best_for", [])]
+    for t in tokens:
+        if any(t in b for b in best_for):
+            score += 2.0
+    if agent.get("category", "").lower() in ("file-search", "rag") and any(
+        w in ("file", "search", "document", "esg", "compliance", "gap") for w in tokens
+    ):
+        score += 1.5
+    return score
+
+
+def top_k(agents: list[dict], tokens: set[str], k: int) -> list[tuple[float, int, dict]]:
+    """Top-k (score, position, agent) of one shard, best first; ties keep catalogue order."""
+    scored = [(score_agent(agent, tokens), i, agent) for i, agent in enumerate(agents)]
+    scored.sort(key=lambda x: (-x[0], x[1]))
+    return scored[:k]
+
+
+def search_registry(
+    product_name: str,
+    product_domain: str,
+    one_liner: str,
+    opportunities: list[dict] | None = None,
+    max_agents: int = 4,
+) -> list[dict]:
+    """
+    Search the registry for agents relevant to the product and opportunities.
+    Scatter-gather: shards are fetched in parallel, each contributes its own top-k, and results are merged
+    by score (ties by shard order, then catalogue order), keeping the best-ranked copy of agents listed in
+    several shards. A shard slower than AGENT_REGISTRY_SHARD_TIMEOUT_S
+    is left out. Returns list of full agent dicts (with metrics) for simulation.
+    Blocking: call it from async code through asyncio.to_thread.
+    """
+    tokens = _query_tokens(product_name, product_domain, one_liner, opportunities)
+    k = max(2, max_agents)
+    shards = _gather(registry_sources(), env_float("AGENT_REGISTRY_SHARD_TIMEOUT_S", 2.0))
+    per_shard = [top_k(agents, tokens, k) if agents else None for agents in shards]
+    merged = [(score, shard_idx, i, agent) for shard_idx, hits in enumerate(per_shard) if hits for score, i, agent in hits]
+    if not merged:
+        return []
+    merged.sort(key=lambda x: (-x[0], x[1], x[2]))
+    # Return at least top 2 if any score > 0, else the first agents in catalogue order for demo
+    if merged[0][0] <= 0:
+        merged.sort(key=lambda x: (x[1], x[2]))
+        return _unique([a for *_, a in merged])[:max_agents]
+    return _unique([a for *_, a in merged])[:k]
+
+
+def simulate_run(agent: dict, use_case_name: str, measured: BenchmarkMetrics | None = None) -> EvalResult:
     """
     Simulate a run of the product's use case with this agent using its registry metrics.
     Produces completeness, determinism, fit, and overall score from metrics (no real execution).
+    measured (from benchmark.run_candidates) is reported alongside but not scored: stand-in latencies are
+    sub-millisecond and would not be comparable with registry figures or with agents that have no stand-in.
     """
     name = agent.get("name", "Unknown")
     metrics = agent.get("metrics") or {}
@@ -123,6 +299,12 @@ def simulate_run(agent: dict, use_case_name: str) -> EvalResult:
         f"Simulated from registry: latency_p95={latency}ms, accuracy_retrieval={acc}, "
         f"best_for={', '.join(best_for[:3])}."
     )
+    if measured is not None:
+        notes += (
+            f" Measured on local stand-in ({measured.adapter}, not used in scores): "
+            f"p50={measured.latency_p50_ms}ms, p95={measured.latency_p95_ms}ms, "
+            f"{measured.throughput_qps} qps, top-{measured.top_k} accuracy={measured.accuracy_retrieval}."
+        )
     return EvalResult(
         framework_name=name,
         score_completeness=score_completeness,
@@ -130,4 +312,5 @@ def simulate_run(agent: dict, use_case_name: str) -> EvalResult:
         score_fit=score_fit,
         overall_score=overall,
         notes=notes,
+        measured=measured,
     )
@@ -30,6 +30,24 @@ class GenerateMockDataIn(BaseModel):
 
     use_case_id: str
     use_case_name: str
+    seed: int = 0
+    n_records: int = Field(default=0, ge=0, description="Size of the synthetic corpus to write to disk; 0 = payload only")
+    chunk_size: int = Field(default=10000, ge=1, description="Records per JSONL chunk file")
+    out_dir: str | None = Field(default=None, description="Subdirectory of MOCK_CORPUS_DIR; default <use_case_id>-s<seed>")
+
+
+class CorpusManifest(BaseModel):
+    """Where a generated mock corpus lives on disk (mock_corpus.py)."""
+
+    use_case_id: str
+    use_case_name: str
+    path: str
+    files: list[str] = Field(description="Chunked JSONL files, in record order")
+    n_records: int
+    chunk_size: int
+    seed: int
+    kinds: list[str] = Field(description="Record kinds: ticket, policy, evidence")
+    bytes: int
 
 
 class MockDataOut(BaseModel):
@@ -37,6 +55,7 @@ class MockDataOut(BaseModel):
 
     use_case_id: str
     payload: dict
+    corpus: CorpusManifest | None = None
 
 
 class EvaluateFrameworkIn(BaseModel):
@@ -47,6 +66,19 @@ class EvaluateFrameworkIn(BaseModel):
     use_case_name: str
 
 
+class BenchmarkMetrics(BaseModel):
+    """Metrics measured by running an agent's local stand-in (benchmark.py)."""
+
+    adapter: str = Field(description="Stand-in used, e.g. local-file-search")
+    queries: int
+    top_k: int
+    latency_p50_ms: float
+    latency_p95_ms: float
+    throughput_qps: float
+    accuracy_retrieval: float = Field(ge=0, le=1, description="Share of queries with a ground-truth document in the top k")
+    index_ms: float
+
+
 class EvalResult(BaseModel):
     """Structured evaluation metrics for a framework."""
 
@@ -56,6 +88,22 @@ class EvalResult(BaseModel):
     score_fit: float = Field(ge=0, le=1)
     overall_score: float = Field(ge=0, le=1)
     notes: str
+    measured: BenchmarkMetrics | None = Field(default=None, description="Metrics measured on a local stand-in (benchmark mode); reported only, not used in scores")
+
+
+class EvaluateFrameworksBatchIn(BaseModel):
+    """Input for evaluate_frameworks_batch skill: many frameworks, one payload."""
+
+    framework_names: list[str]
+    mock_payload: dict
+    use_case_name: str
+
+
+class EvaluateFrameworksBatchOut(BaseModel):
+    """Output of evaluate_frameworks_batch, results in framework_names order."""
+
+    payload_fingerprint: str
+    results: list[EvalResult]
 
 
 class RecommendAdoptionIn(BaseModel):
@@ -141,3 +189,73 @@ class NotificationReport(BaseModel):
     agents_tested: list[AgentTestResult]
     overall_insights: str = Field(description="Custom performance insights across agents")
     notification_message: str = Field(description="Short summary meant to symbolise the notification to the user")
+
+
+# --- LLM call layer metrics (llm_client.py) ---
+
+
+class CircuitBreakerState(BaseModel):
+    """Circuit breaker around the LLM provider."""
+
+    state: str = Field(description="closed, open or half_open")
+    consecutive_failures: int
+    failure_threshold: int
+    reset_after_s: float
+    times_opened: int
+    open_for_s: float = Field(description="Seconds since the breaker opened; 0 when closed")
+
+
+class LLMStepMetrics(BaseModel):
+    """Counters for one LLM-backed pipeline step."""
+
+    step: str
+    calls: int = 0
+    successes: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    retries: int = 0
+    hedges_launched: int = 0
+    hedges_won: int = 0
+    short_circuited: int = Field(default=0, description="Calls skipped because the breaker was open")
+    fallbacks: int = Field(default=0, description="Calls answered by the rule-based fallback")
+    last_latency_ms: float | None = None
+    last_error: str | None = None
+
+
+class LLMClientMetrics(BaseModel):
+    """Output of llm_client_metrics: breaker state, call policy and per-step counters."""
+
+    breaker: CircuitBreakerState
+    attempt_timeout_s: float
+    deadline_s: float
+    max_retries: int
+    hedge_after_s: float | None
+    steps: list[LLMStepMetrics]
+
+
+# --- Real execution benchmarking (benchmark.py) ---
+
+
+class BenchmarkAgentsIn(BaseModel):
+    """Input for benchmark_agents skill."""
+
+    use_case_id: str
+    use_case_name: str
+    agent_names: list[str] = Field(default_factory=list, description="Registry agents to run; empty = all")
+    top_k: int = Field(default=3, ge=1, le=50, description="Hits per query that count towards retrieval accuracy")
+    repeats: int = Field(default=1, ge=1, le=20, description="Passes over the fixture queries (more = steadier latencies)")
+
+
+class AgentBenchmark(BaseModel):
+    """Measured metrics for one registry agent."""
+
+    agent_name: str
+    metrics: BenchmarkMetrics
+
+
+class BenchmarkAgentsOut(BaseModel):
+    """Output of benchmark_agents. Agents without a local stand-in are listed in skipped."""
+
+    use_case_id: str
+    results: list[AgentBenchmark]
+    skipped: list[str]
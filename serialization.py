@@ -0,0 +1,41 @@
+"""
+Response body encoding. Uses orjson when installed (optional: pip install orjson), else the stdlib encoder.
+Output is byte-identical to Starlette's JSONResponse for what the agent returns (tests/test_serialization.py).
+Known differences: floats with magnitude outside [1e-4, 1e16) use a different exponent notation (1e-5 vs 1e-05),
+and NaN/inf become null instead of raising. Content orjson rejects (e.g. ints beyond 64 bits) goes to the stdlib encoder.
+"""
+
+import json
+import os
+from typing import Any
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON, same bytes as JSONResponse.render (see module docstring for the exceptions)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(content)
+        except TypeError:  # orjson.JSONEncodeError: ints beyond 64 bits, unsupported types
+            pass
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def response_class() -> type[JSONResponse]:
+    """Response class for the agent's endpoints; FAST_JSON=0 keeps Starlette's default encoder."""
+    if orjson is None or os.getenv("FAST_JSON", "1") == "0":
+        return JSONResponse
+    return FastJSONResponse
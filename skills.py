@@ -1,43 +1,111 @@
-"""Deterministic skills: generate_mock_data, evaluate_framework. No LLM; pure/template-based."""
+"""Deterministic skills: generate_mock_data, evaluate_framework, evaluate_frameworks_batch, benchmark_agents. No LLM; pure/template-based."""
 
+import hashlib
+import json
+
+import benchmark
+import mock_corpus
+import registry
 from schemas import (
+    AgentBenchmark,
+    BenchmarkAgentsIn,
+    BenchmarkAgentsOut,
     EvalResult,
     EvaluateFrameworkIn,
+    EvaluateFrameworksBatchIn,
+    EvaluateFrameworksBatchOut,
     GenerateMockDataIn,
     MockDataOut,
 )
 
 
+def mock_payload(use_case_id: str, use_case_name: str, seed: int = 0) -> dict:
+    """Deterministic mock payload for a use case: fixed sample ticket plus the first records of its seeded corpus."""
+    return {
+        "use_case": use_case_name,
+        "use_case_id": use_case_id,
+        "mock_input": "deterministic_sample",
+        "scenario": "default",
+        "sample_ticket": {"subject": "Support request", "body": "Need help with integration"},
+        "seed": seed,
+        "kinds": mock_corpus.kinds_for(use_case_id, use_case_name),
+        "sample_records": list(mock_corpus.iter_records(use_case_id, use_case_name, 3, seed)),
+    }
+
+
+def payload_fingerprint(payload: dict) -> str:
+    """Stable sha256 of a mock payload (canonical JSON: sorted keys, compact)."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def rubric_scores(framework_name: str, use_case_name: str, fingerprint: str) -> tuple[float, float, float, float]:
+    """
+    (completeness, determinism, fit, overall) from a sha256 digest of the inputs.
+    Unlike the salted built-in hash(), the digest is identical across processes and replicas, so results can be cached and shared.
+    """
+    digest = hashlib.sha256(f"{framework_name}\0{use_case_name}\0{fingerprint}".encode("utf-8")).digest()
+    base = int.from_bytes(digest[:8], "big") % 1000 / 1000.0
+    s1 = min(1.0, round(0.7 + (base * 0.25), 2))
+    s2 = min(1.0, round(0.75 + ((1 - base) * 0.2), 2))
+    s3 = min(1.0, round(0.65 + (base * 0.3), 2))
+    overall = round((s1 + s2 + s3) / 3, 2)
+    return s1, s2, s3, overall
+
+
+def _rubric_result(framework_name: str, use_case_name: str, fingerprint: str) -> EvalResult:
+    s1, s2, s3, overall = rubric_scores(framework_name, use_case_name, fingerprint)
+    # Scores are bounded by construction: skip re-validation
+    return EvalResult.model_construct(
+        framework_name=framework_name,
+        score_completeness=s1,
+        score_determinism=s2,
+        score_fit=s3,
+        overall_score=overall,
+        notes=f"Deterministic rubric applied to mock payload {fingerprint[:12]}.",
+    )
+
+
 def register(app):
     """Register skill handlers on the given Agent. Call from main.py after creating app."""
 
     @app.skill()
     def generate_mock_data(inp: GenerateMockDataIn) -> MockDataOut:
-        """Produce deterministic mock data for a use case. Same input -> same output."""
-        payload = {
-            "use_case": inp.use_case_name,
-            "use_case_id": inp.use_case_id,
-            "mock_input": "deterministic_sample",
-            "scenario": "default",
-            "sample_ticket": {"subject": "Support request", "body": "Need help with integration"},
-        }
-        return MockDataOut(use_case_id=inp.use_case_id, payload=payload)
+        """Produce deterministic mock data for a use case. Same input -> same output.
+        With n_records > 0 the full seeded corpus is streamed to disk as chunked JSONL (see mock_corpus.py)."""
+        corpus = None
+        if inp.n_records:
+            corpus = mock_corpus.write_corpus(
+                inp.use_case_id, inp.use_case_name, inp.n_records, seed=inp.seed, chunk_size=inp.chunk_size, out_dir=inp.out_dir
+            )
+        return MockDataOut(
+            use_case_id=inp.use_case_id,
+            payload=mock_payload(inp.use_case_id, inp.use_case_name, inp.seed),
+            corpus=corpus,
+        )
 
     @app.skill()
     def evaluate_framework(inp: EvaluateFrameworkIn) -> EvalResult:
-        """Fixed rubric over mock data. No LLM; deterministic scores."""
-        # Deterministic: hash-like scores from framework name + use case name
-        base = hash((inp.framework_name, inp.use_case_name)) % 1000 / 1000.0
-        s1 = round(0.7 + (base * 0.25), 2)
-        s2 = round(0.75 + ((1 - base) * 0.2), 2)
-        s3 = round(0.65 + (base * 0.3), 2)
-        s1, s2, s3 = min(1.0, s1), min(1.0, s2), min(1.0, s3)
-        overall = round((s1 + s2 + s3) / 3, 2)
-        return EvalResult(
-            framework_name=inp.framework_name,
-            score_completeness=s1,
-            score_determinism=s2,
-            score_fit=s3,
-            overall_score=overall,
-            notes="Deterministic rubric applied to mock payload.",
+        """Fixed rubric over mock data. No LLM; same scores in every process (see rubric_scores)."""
+        return _rubric_result(inp.framework_name, inp.use_case_name, payload_fingerprint(inp.mock_payload))
+
+    @app.skill()
+    def evaluate_frameworks_batch(inp: EvaluateFrameworksBatchIn) -> EvaluateFrameworksBatchOut:
+        """evaluate_framework for many frameworks on one payload; the payload is fingerprinted once."""
+        fingerprint = payload_fingerprint(inp.mock_payload)
+        return EvaluateFrameworksBatchOut(
+            payload_fingerprint=fingerprint,
+            results=[_rubric_result(name, inp.use_case_name, fingerprint) for name in inp.framework_names],
+        )
+
+    @app.skill()
+    def benchmark_agents(inp: BenchmarkAgentsIn) -> BenchmarkAgentsOut:
+        """Run registry agents against their local stand-ins on the use case's fixture corpus and return measured metrics."""
+        wanted = {n.lower() for n in inp.agent_names}
+        agents = [a for a in registry.load_registry() if not wanted or a.get("name", "").lower() in wanted]
+        measured = benchmark.run_candidates(agents, inp.use_case_id, inp.use_case_name, k=inp.top_k, repeats=inp.repeats)
+        return BenchmarkAgentsOut(
+            use_case_id=inp.use_case_id,
+            results=[AgentBenchmark(agent_name=name, metrics=m) for name, m in measured.items()],
+            skipped=[a.get("name", "Unknown") for a in agents if a.get("name", "Unknown") not in measured],
         )
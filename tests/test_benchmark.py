@@ -0,0 +1,46 @@
+import copy
+
+import pytest
+from pydantic import ValidationError
+
+import benchmark
+import registry
+from schemas import BenchmarkAgentsIn
+
+USE_CASE = ("o1", "Document gap analysis")
+
+
+def _agent(features: list[str]) -> dict:
+    return {
+        "name": "Stand-in",
+        "category": "file-search",
+        "features": features,
+        "metrics": {"file_formats": ["pdf", "docx", "csv", "xlsx", "html", "md", "txt"]},
+    }
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_fuzzy_never_less_accurate_than_exact(seed):
+    corpus = benchmark.build_fixture_corpus(*USE_CASE, seed=seed)
+    exact = benchmark.benchmark_agent(_agent(["keyword search"]), corpus)
+    fuzzy = benchmark.benchmark_agent(_agent(["semantic search"]), corpus)
+    assert fuzzy.accuracy_retrieval >= exact.accuracy_retrieval
+
+
+def test_run_candidates_leaves_registry_untouched():
+    agents = registry.load_registry()
+    before = copy.deepcopy(agents)
+    measured = benchmark.run_candidates(agents, *USE_CASE)
+    assert measured
+    assert agents == before
+    agent = next(a for a in agents if a["name"] in measured)
+    simulated = registry.simulate_run(agent, USE_CASE[1])
+    reported = registry.simulate_run(agent, USE_CASE[1], measured[agent["name"]])
+    assert reported.overall_score == simulated.overall_score
+    assert reported.measured == measured[agent["name"]]
+
+
+@pytest.mark.parametrize("field, value", [("top_k", 0), ("top_k", -1), ("top_k", 51), ("repeats", 0), ("repeats", 21)])
+def test_benchmark_input_bounds(field, value):
+    with pytest.raises(ValidationError):
+        BenchmarkAgentsIn(use_case_id="o1", use_case_name="Document gap analysis", **{field: value})
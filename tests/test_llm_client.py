@@ -0,0 +1,138 @@
+import asyncio
+import time
+
+import pytest
+
+from llm_client import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, LLMClient
+
+
+class Flaky:
+    """Factory for fake LLM calls: each call pops the next behaviour (an exception, a delay, or a value)."""
+
+    def __init__(self, *behaviours):
+        self.behaviours = list(behaviours)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        behaviour = self.behaviours.pop(0) if len(self.behaviours) > 1 else self.behaviours[0]
+        return self._run(behaviour)
+
+    async def _run(self, behaviour):
+        if isinstance(behaviour, BaseException):
+            raise behaviour
+        if isinstance(behaviour, tuple):  # (delay_s, value)
+            await asyncio.sleep(behaviour[0])
+            return behaviour[1]
+        return behaviour
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def _client(**kwargs) -> LLMClient:
+    kwargs.setdefault("backoff_base_s", 0.001)
+    kwargs.setdefault("backoff_max_s", 0.001)
+    return LLMClient(**kwargs)
+
+
+def _call(client: LLMClient, factory, step: str = "step"):
+    return asyncio.run(client.call(step, factory, fallback=lambda: "fallback"))
+
+
+def test_breaker_opens_after_failed_calls_and_short_circuits_until_reset():
+    client = _client(max_retries=0, breaker=CircuitBreaker(failure_threshold=2, reset_after_s=0.2))
+    failing = Flaky(ConnectionError("down"))
+    assert _call(client, failing) == "fallback"
+    assert client.breaker.state == CLOSED
+    assert _call(client, failing) == "fallback"
+    assert client.breaker.state == OPEN
+
+    assert _call(client, failing) == "fallback"
+    assert failing.calls == 2  # short-circuited: the provider was not called
+    assert client.metrics().steps[0].short_circuited == 1
+
+    time.sleep(0.25)
+    assert _call(client, Flaky("ok")) == "ok"
+    assert client.breaker.state == CLOSED
+
+
+def test_one_failed_call_counts_once_however_many_retries():
+    client = _client(max_retries=2, breaker=CircuitBreaker(failure_threshold=3))
+    failing = Flaky(ConnectionError("reset"))
+    assert _call(client, failing) == "fallback"
+    assert failing.calls == 3
+    assert client.breaker.consecutive_failures == 1
+    assert client.breaker.state == CLOSED
+
+
+@pytest.mark.parametrize("probe, state", [("ok", CLOSED), (ConnectionError("still down"), OPEN)])
+def test_half_open_probe_decides_state(probe, state):
+    client = _client(max_retries=0, breaker=CircuitBreaker(failure_threshold=1, reset_after_s=0.05))
+    _call(client, Flaky(ConnectionError("down")))
+    assert client.breaker.state == OPEN
+    time.sleep(0.06)
+    _call(client, Flaky(probe))
+    assert client.breaker.state == state
+    assert client.breaker.times_opened == (1 if state == CLOSED else 2)
+
+
+def test_cancelled_probe_releases_its_slot():
+    client = _client(max_retries=0, breaker=CircuitBreaker(failure_threshold=1, reset_after_s=0.05))
+    _call(client, Flaky(ConnectionError("down")))
+    time.sleep(0.06)
+
+    async def cancel_probe():
+        probe = asyncio.ensure_future(client.call("step", Flaky((10, "late")), fallback=lambda: "fallback"))
+        await asyncio.sleep(0.05)
+        assert client.breaker.state == HALF_OPEN
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+    asyncio.run(cancel_probe())
+    next_call = Flaky("ok")
+    assert _call(client, next_call) == "ok"
+    assert next_call.calls == 1
+    assert client.breaker.state == CLOSED
+
+
+@pytest.mark.parametrize("error", [ValueError("bad output"), HTTPError(400), HTTPError(401)])
+def test_client_errors_are_not_retried(error):
+    client = _client(max_retries=2)
+    failing = Flaky(error)
+    assert _call(client, failing) == "fallback"
+    assert failing.calls == 1
+    assert client.metrics().steps[0].retries == 0
+
+
+@pytest.mark.parametrize("error", [ConnectionError("reset"), HTTPError(429), HTTPError(503)])
+def test_transient_errors_are_retried(error):
+    client = _client(max_retries=2)
+    flaky = Flaky(error, "ok")
+    assert _call(client, flaky) == "ok"
+    assert flaky.calls == 2
+    assert client.metrics().steps[0].retries == 1
+
+
+def test_hedge_wins_when_primary_is_slow():
+    client = _client(max_retries=0, attempt_timeout_s=5, hedge_after_s=0.05)
+    start = time.monotonic()
+    assert _call(client, Flaky((2, "primary"), (0, "hedge"))) == "hedge"
+    assert time.monotonic() - start < 1
+    m = client.metrics().steps[0]
+    assert (m.hedges_launched, m.hedges_won) == (1, 1)
+
+
+def test_deadline_caps_retries():
+    client = _client(max_retries=10, attempt_timeout_s=0.1, deadline_s=0.25)
+    hanging = Flaky((10, "never"))
+    start = time.monotonic()
+    assert _call(client, hanging) == "fallback"
+    assert time.monotonic() - start < 0.5
+    assert hanging.calls <= 3
+    m = client.metrics().steps[0]
+    assert m.timeouts == hanging.calls and m.fallbacks == 1
@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import mock_corpus
+from schemas import CorpusManifest
+
+
+@pytest.fixture(autouse=True)
+def corpus_root(tmp_path, monkeypatch):
+    monkeypatch.setenv("MOCK_CORPUS_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_reproducible_and_streamed_back():
+    manifest = mock_corpus.write_corpus("o1", "Document gap analysis", 25, seed=3, chunk_size=10)
+    assert manifest.files == ["part-00000.jsonl", "part-00001.jsonl", "part-00002.jsonl"]
+    assert list(mock_corpus.read_corpus(manifest)) == list(mock_corpus.iter_records("o1", "Document gap analysis", 25, seed=3))
+
+
+@pytest.mark.parametrize("out_dir", ["../escape", "/etc", ".", "a/../../b"])
+def test_out_dir_cannot_leave_corpus_root(out_dir):
+    with pytest.raises(ValueError):
+        mock_corpus.write_corpus("o1", "x", 5, out_dir=out_dir)
+
+
+def test_foreign_manifest_is_stale(corpus_root):
+    (corpus_root / "run").mkdir()
+    (corpus_root / "run" / "manifest.json").write_text('{"not": "a manifest"}')
+    manifest = mock_corpus.write_corpus("o1", "x", 5, out_dir="run")
+    assert manifest.n_records == 5
+
+
+def test_regenerating_removes_old_parts(corpus_root):
+    mock_corpus.write_corpus("o1", "x", 30, chunk_size=10, out_dir="run")
+    manifest = mock_corpus.write_corpus("o1", "x", 5, chunk_size=10, out_dir="run")
+    assert sorted(p.name for p in (corpus_root / "run").glob("part-*.jsonl")) == manifest.files == ["part-00000.jsonl"]
+
+
+def test_concurrent_writes_leave_a_consistent_corpus(corpus_root):
+    sizes = [30, 70] * 4
+    with ThreadPoolExecutor(len(sizes)) as pool:
+        list(pool.map(lambda n: mock_corpus.write_corpus("o1", "x", n, chunk_size=10, out_dir="run"), sizes))
+    manifest = CorpusManifest.model_validate_json((corpus_root / "run" / "manifest.json").read_text())
+    assert sorted(p.name for p in (corpus_root / "run").glob("part-*.jsonl")) == manifest.files
+    assert list(mock_corpus.read_corpus(manifest)) == list(mock_corpus.iter_records("o1", "x", manifest.n_records))
+    assert [p.name for p in corpus_root.iterdir()] == ["run"]  # no temporary directories left behind
+
+
+def test_regenerating_keeps_other_content(corpus_root):
+    mock_corpus.write_corpus("o1", "x", 5, out_dir="run")
+    mock_corpus.write_corpus("o1", "x", 5, out_dir="run/nested")
+    mock_corpus.write_corpus("o1", "x", 8, out_dir="run")
+    nested = corpus_root / "run" / "nested"
+    assert (nested / "manifest.json").exists() and (nested / "part-00000.jsonl").exists()
@@ -0,0 +1,116 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import registry
+
+QUERY = dict(
+    product_name="ESG Gap Compliance",
+    product_domain="ESG / Sustainability reporting",
+    one_liner="AI gap analysis compliance platform for ESG reporting, relying on file search AI agents and tools",
+    opportunities=[{"title": "Document gap analysis"}],
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(registry, "_SHARDS", {})
+    monkeypatch.setattr(registry, "_INFLIGHT", {})
+    monkeypatch.setenv("AGENT_REGISTRY_SHARD_TIMEOUT_S", "0.3")
+
+
+@pytest.fixture
+def server():
+    """Local HTTP catalogue stand-in: /slow sleeps 1s, /list serves a JSON array; counts requests per path."""
+    agents = json.loads(registry._registry_path().read_text())["agents"][3:]
+    for a in agents:  # a different vendor's catalogue, not a copy of the bundled one
+        a["id"], a["name"] = f"vendor-{a['id']}", f"Vendor {a['name']}"
+    hits: dict[str, int] = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits[self.path] = hits.get(self.path, 0) + 1
+            if self.path == "/slow":
+                time.sleep(1)
+            body = json.dumps(agents if self.path == "/list" else {"agents": agents}).encode()
+            try:
+                self.send_response(200)
+                self.end_headers()
+                self.wfile.write(body)
+            except OSError:
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}", hits
+    srv.shutdown()
+
+
+def test_default_single_shard_ranking():
+    assert [a["id"] for a in registry.search_registry(**QUERY)] == ["docrag-pro", "comply-scan", "semantic-lens", "filehound"]
+
+
+def test_relative_sources_resolve_like_default(monkeypatch):
+    monkeypatch.setenv("AGENT_REGISTRY_SOURCES", "agent_registry.json")
+    assert registry.registry_sources() == [str(registry._registry_path())]
+
+
+def test_slow_single_url_shard_times_out(monkeypatch, server):
+    url, _ = server
+    monkeypatch.setenv("AGENT_REGISTRY_SOURCES", f"{url}/slow")
+    start = time.monotonic()
+    assert registry.search_registry(**QUERY) == []
+    assert time.monotonic() - start < 0.8
+
+
+def test_slow_shard_fetched_once_and_fills_cache(monkeypatch, server):
+    url, hits = server
+    monkeypatch.setenv("AGENT_REGISTRY_SOURCES", f"agent_registry.json,{url}/slow")
+    for _ in range(3):
+        assert len(registry.search_registry(**QUERY)) == 4
+    time.sleep(1.2)
+    assert hits["/slow"] == 1
+    assert len(registry.load_registry()) == 9
+
+
+def test_non_object_document_is_skipped(monkeypatch, server):
+    url, _ = server
+    monkeypatch.setenv("AGENT_REGISTRY_SOURCES", f"agent_registry.json,{url}/list")
+    assert len(registry.load_registry()) == 6
+    monkeypatch.setenv("AGENT_REGISTRY_SOURCES", f"{url}/list")
+    assert registry.search_registry(**QUERY) == []
+
+
+def test_malformed_agents_dropped_rest_of_shard_kept(monkeypatch, tmp_path):
+    shard = tmp_path / "vendor.json"
+    shard.write_text(
+        json.dumps(
+            {
+                "agents": [
+                    {"name": "Bad", "features": ["search", 3]},
+                    {"name": "Worse", "metrics": {"latency_p95_ms": "fast"}},
+                    {"features": ["search"]},
+                    {"id": "ok", "name": "Fine Search", "category": "file-search", "features": ["search"]},
+                ]
+            }
+        )
+    )
+    monkeypatch.setenv("AGENT_REGISTRY_SOURCES", f"agent_registry.json,{shard}")
+    assert [a["name"] for a in registry.load_registry()][6:] == ["Fine Search"]
+    assert len(registry.search_registry(**QUERY)) == 4
+
+
+def test_overlapping_shards_return_each_agent_once(monkeypatch, tmp_path):
+    copy = tmp_path / "copy.json"
+    copy.write_text(registry._registry_path().read_text())
+    monkeypatch.setenv("AGENT_REGISTRY_SOURCES", f"agent_registry.json,agent_registry.json,{copy}")
+    assert registry.registry_sources() == [str(registry._registry_path()), str(copy)]
+    assert [a["id"] for a in registry.search_registry(**QUERY)] == ["docrag-pro", "comply-scan", "semantic-lens", "filehound"]
+    assert all(a["shard"] == str(registry._registry_path()) for a in registry.search_registry(**QUERY))
+    assert len(registry.load_registry()) == 6
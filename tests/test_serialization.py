@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+import serialization
+from schemas import NotificationReport, ProductDescription
+
+PRODUCT = ProductDescription(
+    name="ESG Gap Compliance — é",
+    domain="ESG / Sustainability reporting",
+    one_liner="AI gap analysis compliance platform for ESG reporting, relying on file search AI agents and tools",
+)
+
+
+def _both(content) -> tuple[bytes, bytes]:
+    """Encode like FastAPI does: jsonable_encoder, then the response class."""
+    encoded = jsonable_encoder(content)
+    return JSONResponse(encoded).body, serialization.FastJSONResponse(encoded).body
+
+
+@pytest.mark.parametrize("pipeline", ["evaluate_pipeline_demo", "evaluate_pipeline"])
+def test_report_bytes_identical(app, pipeline):
+    report = asyncio.run(app.handlers[pipeline](PRODUCT))
+    default, fast = _both(report)
+    assert default == fast
+
+
+def test_llm_client_metrics_bytes_identical(app):
+    asyncio.run(app.handlers["evaluate_pipeline"](PRODUCT))
+    metrics = asyncio.run(app.handlers["llm_client_metrics"]())
+    assert metrics.steps  # the pipeline went through the call layer
+    default, fast = _both(metrics)
+    assert default == fast
+
+
+def test_constructed_report_matches_validated(app):
+    report = asyncio.run(app.handlers["evaluate_pipeline_demo"](PRODUCT))
+    validated = NotificationReport.model_validate(report.model_dump())
+    assert report.model_dump_json() == validated.model_dump_json()
+
+
+def test_unsupported_content_falls_back_to_stdlib():
+    content = {"big": 2**70, "s": "é"}
+    assert serialization.dumps(content) == JSONResponse(content).body
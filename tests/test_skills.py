@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import skills
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_rubric_scores_stable_across_hash_seeds():
+    code = "import skills; print(skills.rubric_scores('LangChain', 'Doc gap', skills.payload_fingerprint(skills.mock_payload('o1', 'Doc gap'))))"
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True,
+            env={**os.environ, "PYTHONHASHSEED": seed},
+        ).stdout
+        for seed in ("1", "2", "3")
+    }
+    assert len(outputs) == 1
+
+
+def test_fingerprint_ignores_key_order():
+    assert skills.payload_fingerprint({"a": 1, "b": [1, 2]}) == skills.payload_fingerprint({"b": [1, 2], "a": 1})